@@ -0,0 +1,48 @@
+"""add parse_results user indexes
+
+Revision ID: a1c3e5f7b901
+Revises: 
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b901'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_parse_results_user_id": ["user_id"],
+    "ix_parse_results_user_filename": ["user_id", "filename"],
+}
+
+
+def upgrade() -> None:
+    existing = set()
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        # Tables are created by the application on startup; a fresh database
+        # gets these indexes from the model definition instead.
+        if "parse_results" not in inspector.get_table_names():
+            return
+        existing = {index["name"] for index in inspector.get_indexes("parse_results")}
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            if name not in existing:
+                op.create_index(name, "parse_results", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    if not context.is_offline_mode():
+        # Nothing to undo if the upgrade found no table to change
+        if "parse_results" not in sa.inspect(op.get_bind()).get_table_names():
+            return
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="parse_results", postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""add parse_results content_hash
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b901
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c013'
+down_revision = 'a1c3e5f7b901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        # Tables are created by the application on startup; a fresh database
+        # gets this column from the model definition instead.
+        if "parse_results" not in inspector.get_table_names():
+            return
+        if "content_hash" in {column["name"] for column in inspector.get_columns("parse_results")}:
+            return
+
+    op.add_column("parse_results", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_parse_results_user_content_hash",
+            "parse_results",
+            ["user_id", "content_hash"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if not context.is_offline_mode():
+        # Nothing to undo if the upgrade found no table to change
+        if "parse_results" not in sa.inspect(op.get_bind()).get_table_names():
+            return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_parse_results_user_content_hash",
+            table_name="parse_results",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("parse_results", "content_hash")
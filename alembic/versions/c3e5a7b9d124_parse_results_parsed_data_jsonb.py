@@ -0,0 +1,57 @@
+"""store parse_results.parsed_data as jsonb on postgresql
+
+Revision ID: c3e5a7b9d124
+Revises: b2d4f6a8c013
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d124'
+down_revision = 'b2d4f6a8c013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Other backends keep the generic JSON type
+    if op.get_context().dialect.name != "postgresql":
+        return
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        if "parse_results" not in inspector.get_table_names():
+            return
+        columns = {column["name"]: column["type"] for column in inspector.get_columns("parse_results")}
+        if isinstance(columns.get("parsed_data"), postgresql.JSONB):
+            return
+
+    op.alter_column(
+        "parse_results",
+        "parsed_data",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="parsed_data::jsonb",
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    if not context.is_offline_mode():
+        # Nothing to undo if the upgrade found no table to change
+        if "parse_results" not in sa.inspect(op.get_bind()).get_table_names():
+            return
+
+    op.alter_column(
+        "parse_results",
+        "parsed_data",
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="parsed_data::json",
+    )
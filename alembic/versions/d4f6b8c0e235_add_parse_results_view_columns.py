@@ -0,0 +1,120 @@
+"""add parse_results precomputed view columns
+
+Revision ID: d4f6b8c0e235
+Revises: c3e5a7b9d124
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e235'
+down_revision = 'c3e5a7b9d124'
+branch_labels = None
+depends_on = None
+
+VIEW_COLUMNS = ["summary_json", "cpu_memory_json", "inventory_json", "interfaces_json"]
+BACKFILL_BATCH_SIZE = 500
+
+# Frozen copy of the extraction as of this revision, so the backfill does not
+# change when app code does. parsed_data command key per view and platform.
+VERSION_COMMANDS = {
+    "cisco_ios": "show version",
+    "cisco_nxos": "show version",
+    "aruba_aoscx": "show system",
+    "huawei_vrp": "display version",
+    "huawei_yunshan": "display version",
+}
+INVENTORY_COMMANDS = {
+    "cisco_ios": "show inventory",
+    "cisco_nxos": "show inventory",
+    "aruba_aoscx": "show inventory",
+    "huawei_vrp": "display device",
+    "huawei_yunshan": "display device",
+}
+INTERFACE_COMMANDS = {
+    "cisco_ios": "show interfaces",
+    "cisco_nxos": "show interface",
+    "aruba_aoscx": "show interface",
+    "huawei_vrp": "display interface",
+    "huawei_yunshan": "display interface",
+}
+
+
+def json_document() -> sa.types.TypeEngine:
+    return sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def build_result_views(device_platform: str, parsed_data: dict) -> dict:
+    version_data = {}
+    version_list = parsed_data.get(VERSION_COMMANDS.get(device_platform))
+    if version_list and isinstance(version_list, list):
+        version_data = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in version_list[0].items()
+        }
+    version_data["platform_name"] = device_platform
+
+    return {
+        "summary_json": version_data,
+        "cpu_memory_json": parsed_data.get("Calculated_CPU_Memory"),
+        "inventory_json": parsed_data.get(INVENTORY_COMMANDS.get(device_platform)),
+        "interfaces_json": parsed_data.get(INTERFACE_COMMANDS.get(device_platform)),
+    }
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        inspector = sa.inspect(op.get_bind())
+        # Tables are created by the application on startup; a fresh database
+        # gets these columns from the model definition instead.
+        if "parse_results" not in inspector.get_table_names():
+            return
+        if "summary_json" in {column["name"] for column in inspector.get_columns("parse_results")}:
+            return
+
+    for name in VIEW_COLUMNS:
+        op.add_column("parse_results", sa.Column(name, json_document(), nullable=True))
+
+    # Backfilling needs the stored rows; offline SQL scripts only add the columns
+    if context.is_offline_mode():
+        return
+
+    parse_results = sa.table(
+        "parse_results",
+        sa.column("id", sa.Integer),
+        sa.column("platform", sa.String),
+        sa.column("parsed_data", sa.JSON),
+        *(sa.column(name, sa.JSON) for name in VIEW_COLUMNS),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(parse_results.c.id, parse_results.c.platform, parse_results.c.parsed_data)
+            .where(parse_results.c.id > last_id)
+            .order_by(parse_results.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(
+                parse_results.update()
+                .where(parse_results.c.id == row.id)
+                .values(**build_result_views(row.platform, row.parsed_data or {}))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    if not context.is_offline_mode():
+        # Nothing to undo if the upgrade found no table to change
+        if "parse_results" not in sa.inspect(op.get_bind()).get_table_names():
+            return
+
+    for name in reversed(VIEW_COLUMNS):
+        op.drop_column("parse_results", name)
@@ -1,8 +1,9 @@
 import os
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import settings
@@ -16,22 +17,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create upload directory
-os.makedirs(settings.upload_dir, exist_ok=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Done on startup rather than at import: parse workers are spawned processes, and under
+    # `python -m app.main` each one re-imports this module
+    # Create upload directory
+    os.makedirs(settings.upload_dir, exist_ok=True)
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created successfully")
-except SQLAlchemyError as e:
-    logger.error(f"Error creating database tables: {e}")
+    # Create database tables
+    try:
+        Base.metadata.create_all(bind=engine)
+        logger.info("Database tables created successfully")
+    except SQLAlchemyError as e:
+        logger.error(f"Error creating database tables: {e}")
+    yield
 
 app = FastAPI(
     title="Network Device Parser API",
     description="FastAPI backend for parsing network device configurations with JWT authentication",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -1,17 +1,33 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 
+# JSON document column, stored as binary JSONB on PostgreSQL
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 class ParseResult(Base):
     __tablename__ = "parse_results"
+    __table_args__ = (
+        Index("ix_parse_results_user_id", "user_id"),
+        Index("ix_parse_results_user_filename", "user_id", "filename"),
+        Index("ix_parse_results_user_content_hash", "user_id", "content_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     filename = Column(String, nullable=False)
     platform = Column(String, nullable=False)
-    parsed_data = Column(JSON, nullable=False)
+    # Large blob; deferred so entity queries only load it where it is needed (undefer)
+    parsed_data = deferred(Column(JSONDocument, nullable=False))
     file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    # Per-view documents extracted from parsed_data at ingest time (see build_result_views)
+    summary_json = deferred(Column(JSONDocument, nullable=True))
+    cpu_memory_json = deferred(Column(JSONDocument, nullable=True))
+    inventory_json = deferred(Column(JSONDocument, nullable=True))
+    interfaces_json = deferred(Column(JSONDocument, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User")
\ No newline at end of file
@@ -1,11 +1,19 @@
-import os
 import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any
+import aiofiles
+import orjson
+from collections import defaultdict
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Iterator, Optional, Set
+from pathlib import Path
+from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from collections import Counter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
 
 from app.database import get_db
 from app.models.user import User
@@ -14,17 +22,190 @@ from app.schemas.parser import (
     ParseResult as ParseResultSchema,
     ParseSummary,
     CPUMemoryData,
-    DeviceInventory,
-    DeviceInterfaces
+    DeviceInventory
+)
+from app.utils.auth import get_current_active_user, get_current_user_id
+from app.utils.parser import (
+    PARSER_VERSION,
+    parse_network_file,
+    build_result_views,
+    get_parse_executor,
+    reset_parse_executor
 )
-from app.utils.auth import get_current_active_user
-from app.utils.parser import parse_network_file
 from app.config import settings
 
 router = APIRouter(prefix="/parser", tags=["parser"])
 logger = logging.getLogger(__name__)
 
-ALLOWED_EXTENSIONS = [".txt", ".log"]
+ALLOWED_EXTENSIONS = frozenset({".txt", ".log"})
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+UPLOAD_CONCURRENCY = 8
+RESULT_BATCH_SIZE = 200
+# blake2b personalization: content hashes from another parser version never match
+CONTENT_HASH_PERSON = f"parser-v{PARSER_VERSION}".encode()
+
+# Users whose upload directory this process has already created
+_user_dirs_created: Set[int] = set()
+
+class ResultJSONResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes with a "Z" suffix, as ParseResultSchema does."""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
+
+def attachment_headers(filename: str) -> Dict[str, str]:
+    """Build a Content-Disposition header the same way FileResponse does."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"attachment; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+def iter_download_json(filename: str, platform: str, parsed_data: Dict[str, Any], created_at: str) -> Iterator[bytes]:
+    """Yield a parse result as JSON, serializing parsed_data one command at a time."""
+    yield b'{"filename":' + orjson.dumps(filename) + b',"platform":' + orjson.dumps(platform) + b',"parsed_data":{'
+    for index, (command, data) in enumerate(parsed_data.items()):
+        yield (b"," if index else b"") + orjson.dumps(command) + b":" + orjson.dumps(data)
+    yield b'},"created_at":' + orjson.dumps(created_at) + b"}"
+
+def result_to_dict(result: ParseResult) -> Dict[str, Any]:
+    """Build the ParseResultSchema payload for a stored result without re-validating it."""
+    return {
+        "filename": result.filename,
+        "platform": result.platform,
+        "parsed_data": result.parsed_data,
+        "id": result.id,
+        "user_id": result.user_id,
+        "file_path": result.file_path,
+        "created_at": result.created_at
+    }
+
+def get_content_hash(content: bytes) -> str:
+    """Return the hex digest used to recognise re-uploads of identical content by the current parser."""
+    return hashlib.blake2b(content, digest_size=32, person=CONTENT_HASH_PERSON).hexdigest()
+
+def find_cached_parse(db: Session, user_id: int, content_hash: str) -> Optional[Dict[str, Any]]:
+    """Return an earlier parse of the same content for this user, if there is one."""
+    # Undetected files are parsed again, in case detection has improved since
+    row = db.execute(
+        select(ParseResult.platform, ParseResult.parsed_data).where(
+            ParseResult.user_id == user_id,
+            ParseResult.content_hash == content_hash,
+            ParseResult.platform != "unknown"
+        ).limit(1)
+    ).first()
+    if row is None:
+        return None
+    return {"model": row.platform, "data": row.parsed_data}
+
+async def parse_in_worker(file_content: str, filename: str) -> Dict[str, Any]:
+    """Parse a file in the shared worker pool, replacing the pool once if a dead worker broke it."""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = get_parse_executor()
+        try:
+            return await loop.run_in_executor(executor, parse_network_file, file_content, filename)
+        except BrokenProcessPool:
+            reset_parse_executor(executor)
+            if attempt:
+                raise
+            logger.warning(f"Parse worker died, retrying {filename} in a new process pool")
+
+async def write_user_file(user_upload_dir: Path, filename: str, content: bytes) -> Path:
+    """Write a file into a user's upload directory, recreating the directory once if it has gone."""
+    file_path = user_upload_dir / filename
+    for attempt in range(2):
+        try:
+            async with aiofiles.open(file_path, "wb") as f:
+                await f.write(content)
+            return file_path
+        except FileNotFoundError:
+            if attempt:
+                raise
+            # Created once per process, but it may since have been removed (cleanup job, volume remount)
+            logger.warning(f"Upload directory {user_upload_dir} is missing, creating it again")
+            user_upload_dir.mkdir(parents=True, exist_ok=True)
+
+async def lookup_or_parse(
+    content: bytes,
+    filename: str,
+    user_id: int,
+    content_hash: str,
+    db: Session,
+    db_lock: asyncio.Lock
+) -> Dict[str, Any]:
+    """Return a stored parse of identical content, or parse the file in the worker pool."""
+    # Query off the event loop; the lock keeps the shared session to one thread at a time
+    async with db_lock:
+        parsed_data = await run_in_threadpool(find_cached_parse, db, user_id, content_hash)
+    if parsed_data is not None:
+        logger.info(f"Reusing cached parse for: {filename}")
+        return parsed_data
+
+    # Decode in memory, normalizing newlines the same way text-mode open() does
+    file_content = (
+        content
+        .decode("utf-8", errors="ignore")
+        .replace("\r\n", "\n")
+        .replace("\r", "\n")
+    )
+
+    # Parse in a worker process: parsing is CPU-bound, so threads would serialise on the GIL
+    return await parse_in_worker(file_content, filename)
+
+async def process_upload(
+    uploaded_file: UploadFile,
+    user_id: int,
+    user_upload_dir: Path,
+    db: Session,
+    parsed_by_hash: Dict[str, "asyncio.Task[Dict[str, Any]]"],
+    semaphore: asyncio.Semaphore,
+    db_lock: asyncio.Lock,
+    file_locks: Dict[str, asyncio.Lock]
+) -> Optional[ParseResult]:
+    """Save and parse one uploaded file, returning an unsaved ParseResult."""
+    # Check file extension
+    file_extension = Path(uploaded_file.filename).suffix.lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        logger.warning(f"Skipping unsupported file extension: {uploaded_file.filename}")
+        return None
+
+    # Parts with the same filename share one path, so they are handled one at a time. The lock is
+    # taken before any other await, so they queue in upload order and the last one is kept on disk.
+    async with file_locks[uploaded_file.filename], semaphore:
+        # Read the upload, then save it with a single write instead of one per chunk
+        chunks = []
+        while chunk := await uploaded_file.read(UPLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+        content = b"".join(chunks)
+
+        file_path = str(await write_user_file(user_upload_dir, uploaded_file.filename, content))
+
+        # Share one lookup-and-parse between identical files in this upload; the task is
+        # registered before any await, so later duplicates wait on it instead of parsing again
+        content_hash = get_content_hash(content)
+        parse_task = parsed_by_hash.get(content_hash)
+        if parse_task is None:
+            parse_task = asyncio.create_task(
+                lookup_or_parse(content, uploaded_file.filename, user_id, content_hash, db, db_lock)
+            )
+            parsed_by_hash[content_hash] = parse_task
+        else:
+            logger.info(f"Reusing cached parse for: {uploaded_file.filename}")
+        parsed_data = await parse_task
+
+    logger.info(f"Successfully parsed: {uploaded_file.filename}")
+
+    return ParseResult(
+        user_id=user_id,
+        filename=uploaded_file.filename,
+        platform=parsed_data["model"],
+        parsed_data=parsed_data["data"],
+        file_path=file_path,
+        content_hash=content_hash,
+        **build_result_views(parsed_data["model"], parsed_data["data"])
+    )
 
 @router.post("/upload", response_model=List[ParseResultSchema])
 async def upload_files(
@@ -39,71 +220,66 @@ async def upload_files(
             detail="No files uploaded"
         )
     
-    # Create user upload directory
-    user_upload_dir = os.path.join(settings.upload_dir, str(current_user.id))
-    os.makedirs(user_upload_dir, exist_ok=True)
-    
-    parsed_results = {}
-    
-    for uploaded_file in files:
-        # Check file extension
-        file_extension = os.path.splitext(uploaded_file.filename)[1].lower()
-        if file_extension not in ALLOWED_EXTENSIONS:
-            logger.warning(f"Skipping unsupported file extension: {uploaded_file.filename}")
-            continue
-        
-        # Save uploaded file
-        file_path = os.path.join(user_upload_dir, uploaded_file.filename)
-        with open(file_path, "wb") as f:
-            content = await uploaded_file.read()
-            f.write(content)
-        
-        # Read and parse file content
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                file_content = f.read()
-        except Exception as e:
-            logger.error(f"Error reading file {uploaded_file.filename}: {e}")
-            continue
-        
-        # Parse the network file
-        parsed_data = parse_network_file(file_content, uploaded_file.filename)
-        
-        # Store in the same format as Django version
-        parsed_results[uploaded_file.filename] = parsed_data
-        
-        # Save to database
-        db_parse_result = ParseResult(
-            user_id=current_user.id,
-            filename=uploaded_file.filename,
-            platform=parsed_data["model"],
-            parsed_data=parsed_data["data"],
-            file_path=file_path
-        )
-        db.add(db_parse_result)
+    # Create user upload directory, once per user per process
+    user_upload_dir = Path(settings.upload_dir) / str(current_user.id)
+    if current_user.id not in _user_dirs_created:
+        user_upload_dir.mkdir(parents=True, exist_ok=True)
+        _user_dirs_created.add(current_user.id)
+    
+    # Process files concurrently, bounded to limit open files and buffered uploads
+    parsed_by_hash = {}
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    db_lock = asyncio.Lock()
+    file_locks = defaultdict(asyncio.Lock)
+    tasks = [
+        asyncio.create_task(process_upload(
+            uploaded_file, current_user.id, user_upload_dir, db, parsed_by_hash, semaphore, db_lock, file_locks
+        ))
+        for uploaded_file in files
+    ]
+    try:
+        processed = await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the other files and wait for them, so none still uses the session once the request ends
+        pending = [*tasks, *parsed_by_hash.values()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+    db_parse_results = [result for result in processed if result is not None]
+
+    # Store in the same format as Django version
+    parsed_results = {
+        result.filename: {"model": result.platform, "data": result.parsed_data}
+        for result in db_parse_results
+    }
+
+    # Save all parse results in one transaction
+    if db_parse_results:
+        db.add_all(db_parse_results)
         db.commit()
-        db.refresh(db_parse_result)
-        
-        logger.info(f"Successfully parsed and saved: {uploaded_file.filename}")
-    
+        logger.info(f"Saved {len(db_parse_results)} parse results for user {current_user.id}")
+
     # Also save the complete parsed results as JSON file (matching Django behavior)
-    json_filename = os.path.join(user_upload_dir, "parsed_output.json")
-    with open(json_filename, "w", encoding="utf-8") as json_file:
-        json.dump(parsed_results, json_file, indent=4)
+    await write_user_file(user_upload_dir, "parsed_output.json", json.dumps(parsed_results, indent=4).encode("utf-8"))
     
     # Return database results for API response
-    db_results = db.query(ParseResult).filter(ParseResult.user_id == current_user.id).all()
+    db_results = db.execute(
+        select(ParseResult)
+        .options(undefer(ParseResult.parsed_data))
+        .where(ParseResult.user_id == current_user.id)
+        .order_by(ParseResult.id)
+    ).scalars().all()
     return db_results
 
 @router.get("/download-json")
 def download_complete_json(
-    current_user: User = Depends(get_current_active_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """Download complete parsed JSON output (matching Django format)."""
-    user_upload_dir = os.path.join(settings.upload_dir, str(current_user.id))
-    json_filename = os.path.join(user_upload_dir, "parsed_output.json")
+    json_filename = Path(settings.upload_dir) / str(current_user_id) / "parsed_output.json"
     
-    if not os.path.exists(json_filename):
+    if not json_filename.exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="JSON file not found"
@@ -117,32 +293,38 @@ def download_complete_json(
 
 @router.get("/results", response_model=List[ParseResultSchema])
 def get_parse_results(
-    current_user: User = Depends(get_current_active_user),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
+    cursor: int = Query(None, description="Return results with an id lower than this (id of the last result of the previous page)"),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
-    """Get all parse results for the current user."""
-    results = db.query(ParseResult).filter(ParseResult.user_id == current_user.id).all()
-    return results
+    """Get parse results for the current user, newest first, one page at a time."""
+    stmt = select(ParseResult).options(undefer(ParseResult.parsed_data)).where(
+        ParseResult.user_id == current_user_id
+    )
+    
+    if cursor is not None:
+        stmt = stmt.where(ParseResult.id < cursor)
+    
+    results = db.execute(stmt.order_by(ParseResult.id.desc()).limit(limit)).scalars().all()
+    return ResultJSONResponse([result_to_dict(result) for result in results])
 
 @router.get("/results/{result_id}", response_model=ParseResultSchema)
 def get_parse_result(
     result_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Get a specific parse result."""
-    result = db.query(ParseResult).filter(
-        ParseResult.id == result_id,
-        ParseResult.user_id == current_user.id
-    ).first()
+    result = db.get(ParseResult, result_id, options=[undefer(ParseResult.parsed_data)])
     
-    if not result:
+    if not result or result.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Parse result not found"
         )
     
-    return result
+    return ResultJSONResponse(result_to_dict(result))
 
 @router.delete("/results/{result_id}")
 def delete_parse_result(
@@ -151,12 +333,9 @@ def delete_parse_result(
     db: Session = Depends(get_db)
 ):
     """Delete a specific parse result."""
-    result = db.query(ParseResult).filter(
-        ParseResult.id == result_id,
-        ParseResult.user_id == current_user.id
-    ).first()
+    result = db.get(ParseResult, result_id)
     
-    if not result:
+    if not result or result.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Parse result not found"
@@ -164,8 +343,9 @@ def delete_parse_result(
     
     # Delete file from filesystem
     try:
-        if os.path.exists(result.file_path):
-            os.remove(result.file_path)
+        file_path = Path(result.file_path)
+        if file_path.exists():
+            file_path.unlink()
     except Exception as e:
         logger.warning(f"Could not delete file {result.file_path}: {e}")
     
@@ -177,170 +357,148 @@ def delete_parse_result(
 
 @router.get("/summary", response_model=List[ParseSummary])
 def get_summary(
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Get summary view of all parsed devices."""
-    results = db.query(ParseResult).filter(ParseResult.user_id == current_user.id).all()
+    rows = db.execute(
+        select(
+            ParseResult.filename,
+            ParseResult.platform,
+            ParseResult.summary_json,
+            ParseResult.cpu_memory_json
+        ).where(ParseResult.user_id == current_user_id).order_by(ParseResult.id),
+        execution_options={"yield_per": RESULT_BATCH_SIZE}
+    )
     
-    if not results:
+    summaries = []
+    for filename, platform, version_data, cpu_memory_data in rows:
+        summaries.append({
+            "filename": filename,
+            "platform": platform,
+            "version_data": version_data or {"platform_name": platform},
+            "cpu_memory_data": cpu_memory_data or {}
+        })
+    
+    if not summaries:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No parse results found"
         )
     
-    summaries = []
-    for result in results:
-        version_data = {}
-        cpu_memory_data = result.parsed_data.get("Calculated_CPU_Memory", {})
-        
-        # Extract version data based on platform
-        if result.platform == "cisco_ios":
-            version_list = result.parsed_data.get("show version", [])
-        elif result.platform == "cisco_nxos":
-            version_list = result.parsed_data.get("show version", [])
-        elif result.platform == "aruba_aoscx":
-            version_list = result.parsed_data.get("show system", [])
-        elif result.platform in ["huawei_vrp", "huawei_yunshan"]:
-            version_list = result.parsed_data.get("display version", [])
-        else:
-            version_list = []
-        
-        if version_list and isinstance(version_list, list) and version_list:
-            version_data = version_list[0]
-            # Clean up string values
-            for key, value in version_data.items():
-                if isinstance(value, str):
-                    version_data[key] = value.strip()
-        
-        version_data['platform_name'] = result.platform
-        
-        summaries.append(ParseSummary(
-            filename=result.filename,
-            platform=result.platform,
-            version_data=version_data,
-            cpu_memory_data=cpu_memory_data
-        ))
-    
-    return summaries
+    return ORJSONResponse(summaries)
 
 @router.get("/cpu-memory", response_model=Dict[str, CPUMemoryData])
 def get_cpu_memory_usage(
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Get CPU and Memory usage for all devices."""
-    results = db.query(ParseResult).filter(ParseResult.user_id == current_user.id).all()
+    rows = db.execute(
+        select(
+            ParseResult.filename,
+            ParseResult.cpu_memory_json
+        ).where(ParseResult.user_id == current_user_id).order_by(ParseResult.id),
+        execution_options={"yield_per": RESULT_BATCH_SIZE}
+    )
+    
+    cpu_memory_data = {}
+    for filename, calculated_data in rows:
+        calculated_data = calculated_data or {}
+        cpu_memory_data[filename] = {
+            "cpu_max": str(calculated_data.get("cpu_max", "N/A")),
+            "cpu_avg": str(calculated_data.get("cpu_avg", "N/A")),
+            "memory_usage_percent": str(calculated_data.get("memory_usage_percent", "N/A"))
+        }
     
-    if not results:
+    if not cpu_memory_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No parse results found"
         )
     
-    cpu_memory_data = {}
-    for result in results:
-        calculated_data = result.parsed_data.get("Calculated_CPU_Memory", {})
-        cpu_memory_data[result.filename] = CPUMemoryData(
-            cpu_max=calculated_data.get("cpu_max", "N/A"),
-            cpu_avg=calculated_data.get("cpu_avg", "N/A"),
-            memory_usage_percent=str(calculated_data.get("memory_usage_percent", "N/A"))
-        )
-    
-    return cpu_memory_data
+    return ORJSONResponse(cpu_memory_data)
 
 @router.get("/inventory", response_model=List[DeviceInventory])
 def get_inventory(
     hostname: str = Query(None, description="Filter by hostname"),
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Get inventory information for devices."""
-    query = db.query(ParseResult).filter(ParseResult.user_id == current_user.id)
+    stmt = select(
+        ParseResult.filename,
+        ParseResult.inventory_json
+    ).where(ParseResult.user_id == current_user_id)
     
     if hostname:
-        query = query.filter(ParseResult.filename == hostname)
+        stmt = stmt.where(ParseResult.filename == hostname)
     
-    results = query.all()
+    rows = db.execute(stmt.order_by(ParseResult.id), execution_options={"yield_per": RESULT_BATCH_SIZE})
     
-    if not results:
+    inventory_data = []
+    for filename, inventory in rows:
+        inventory_data.append({
+            "filename": filename,
+            "inventory": inventory or []
+        })
+    
+    if not inventory_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No parse results found"
         )
     
-    inventory_data = []
-    for result in results:
-        inventory = []
-        
-        if result.platform == "cisco_ios":
-            inventory = result.parsed_data.get("show inventory", [])
-        elif result.platform == "cisco_nxos":
-            inventory = result.parsed_data.get("show inventory", [])
-        elif result.platform == "aruba_aoscx":
-            inventory = result.parsed_data.get("show inventory", [])
-        elif result.platform in ["huawei_vrp", "huawei_yunshan"]:
-            inventory = result.parsed_data.get("display device", [])
-        
-        inventory_data.append(DeviceInventory(
-            filename=result.filename,
-            inventory=inventory
-        ))
-    
-    return inventory_data
+    return ORJSONResponse(inventory_data)
 
 @router.get("/interfaces", response_model=Dict[str, Any])
 def get_interfaces(
     hostname: str = Query(None, description="Filter by hostname"),
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Get interface information for devices with statistics."""
-    query = db.query(ParseResult).filter(ParseResult.user_id == current_user.id)
+    stmt = select(
+        ParseResult.filename,
+        ParseResult.interfaces_json
+    ).where(ParseResult.user_id == current_user_id)
     
     if hostname:
-        query = query.filter(ParseResult.filename == hostname)
+        stmt = stmt.where(ParseResult.filename == hostname)
     
-    results = query.all()
-    
-    if not results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No parse results found"
-        )
+    rows = db.execute(stmt.order_by(ParseResult.id), execution_options={"yield_per": RESULT_BATCH_SIZE})
     
     interface_data = []
-    link_status_counts = Counter()
-    speed_counts = Counter()
+    hostnames = []
+    link_status_counts = {}
+    speed_counts = {}
     
-    for result in results:
-        interfaces = []
+    for filename, interfaces in rows:
+        interfaces = interfaces or []
         
-        if result.platform == "cisco_ios":
-            interfaces = result.parsed_data.get("show interfaces", [])
-        elif result.platform == "cisco_nxos":
-            interfaces = result.parsed_data.get("show interface", [])
-        elif result.platform == "aruba_aoscx":
-            interfaces = result.parsed_data.get("show interface", [])
-        elif result.platform in ["huawei_vrp", "huawei_yunshan"]:
-            interfaces = result.parsed_data.get("display interface", [])
-        
-        interface_data.append(DeviceInterfaces(
-            filename=result.filename,
-            interfaces=interfaces
-        ))
+        interface_data.append({
+            "filename": filename,
+            "interfaces": interfaces
+        })
+        hostnames.append(filename)
         
         # Count statistics
         for iface in interfaces:
             link_status = iface.get("link_status", iface.get("status", "unknown")).lower() or "unknown"
             speed = iface.get("speed", iface.get("bandwidth", "unknown")).lower() or "unknown"
-            
-            link_status_counts[link_status] += 1
-            speed_counts[speed] += 1
+
+            link_status_counts[link_status] = link_status_counts.get(link_status, 0) + 1
+            speed_counts[speed] = speed_counts.get(speed, 0) + 1
     
-    return {
+    if not interface_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No parse results found"
+        )
+    
+    return ORJSONResponse({
         "interface_data": interface_data,
-        "hostnames": [result.filename for result in results],
+        "hostnames": hostnames,
         "selected_hostname": hostname,
         "link_status_stats": {
             "labels": list(link_status_counts.keys()),
@@ -350,46 +508,30 @@ def get_interfaces(
             "labels": list(speed_counts.keys()),
             "values": list(speed_counts.values())
         }
-    }
+    })
 
 @router.get("/download/{result_id}")
 def download_json(
     result_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Download parsed JSON output for a specific result."""
-    result = db.query(ParseResult).filter(
-        ParseResult.id == result_id,
-        ParseResult.user_id == current_user.id
-    ).first()
+    result = db.get(ParseResult, result_id, options=[undefer(ParseResult.parsed_data)])
     
-    if not result:
+    if not result or result.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Parse result not found"
         )
     
-    # Create temporary JSON file
-    temp_json_path = f"/tmp/{result.filename}_{result.id}_parsed.json"
-    
-    try:
-        with open(temp_json_path, "w", encoding="utf-8") as f:
-            json.dump({
-                "filename": result.filename,
-                "platform": result.platform,
-                "parsed_data": result.parsed_data,
-                "created_at": result.created_at.isoformat()
-            }, f, indent=4)
-        
-        return FileResponse(
-            temp_json_path,
-            media_type="application/json",
-            filename=f"{result.filename}_parsed.json"
-        )
-    except Exception as e:
-        logger.error(f"Error creating JSON file: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error creating download file"
-        )
\ No newline at end of file
+    return StreamingResponse(
+        iter_download_json(
+            filename=result.filename,
+            platform=result.platform,
+            parsed_data=result.parsed_data,
+            created_at=result.created_at.isoformat()
+        ),
+        media_type="application/json",
+        headers=attachment_headers(f"{result.filename}_parsed.json")
+    )
@@ -4,6 +4,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
@@ -40,13 +41,13 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
+        token_data = TokenData(username=username, user_id=payload.get("uid"))
     except JWTError:
         raise credentials_exception
     return token_data
 
 def get_current_user(db: Session = Depends(get_db), token_data: TokenData = Depends(verify_token)):
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = db.execute(select(User).where(User.username == token_data.username)).scalars().first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,6 +55,21 @@ def get_current_user(db: Session = Depends(get_db), token_data: TokenData = Depe
         )
     return user
 
+def get_current_user_id(db: Session = Depends(get_db), token_data: TokenData = Depends(verify_token)) -> int:
+    """Return the authenticated, active user's id, looking up only the id and active flag."""
+    user = db.execute(
+        select(User.id, User.is_active).where(User.username == token_data.username)
+    ).first()
+    # Tokens issued before the uid claim existed only carry the username
+    if user is None or (token_data.user_id is not None and token_data.user_id != user.id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user.id
+
 def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -2,9 +2,17 @@ import os
 import re
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
+from functools import lru_cache
 from collections import OrderedDict, Counter
-from ntc_templates.parse import parse_output
+
+# ntc_templates/textfsm are imported on first parse to keep module import cheap
+if TYPE_CHECKING:
+    from textfsm import TextFSM
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +25,27 @@ ENV_PATTERNS = OrderedDict([
     ("aruba_aoscx", (r"ArubaOS-CX", r"show")),
 ])
 
+# All platform markers fused into one alternation so the text is scanned once
+PLATFORM_RE = re.compile(
+    "|".join(
+        f"(?P<{platform_key}>{platform_pattern})"
+        for platform_key, (platform_pattern, _) in ENV_PATTERNS.items()
+    ),
+    re.IGNORECASE
+)
+
+# (platform, compiled command keyword) in detection priority order
+PLATFORM_COMMANDS = tuple(
+    (platform_key, re.compile(command_pattern, re.IGNORECASE))
+    for platform_key, (_, command_pattern) in ENV_PATTERNS.items()
+)
+
+# Leading slice of a file checked for platform banners before the full text
+PLATFORM_SCAN_WINDOW = 64 * 1024
+
+# Platforms sharing the Huawei CPU/memory post-processing
+HUAWEI_PLATFORMS = frozenset({"huawei_vrp", "huawei_yunshan"})
+
 # TextFSM Templates Mapping per Platform and Command
 TEXTFSM_TEMPLATES = {
     "cisco_ios": {
@@ -53,71 +82,202 @@ TEXTFSM_TEMPLATES = {
     },
 }
 
+# Keys whose list values are deduplicated. TextFSM headers come back lowercased;
+# the other spellings are listed so no per-key .lower() call is needed.
+DEDUP_KEYS = frozenset({"serial", "hardware", "Serial", "Hardware", "SERIAL", "HARDWARE"})
+
+# parsed_data command key holding each view's data, per platform
+VERSION_COMMANDS = {
+    "cisco_ios": "show version",
+    "cisco_nxos": "show version",
+    "aruba_aoscx": "show system",
+    "huawei_vrp": "display version",
+    "huawei_yunshan": "display version",
+}
+INVENTORY_COMMANDS = {
+    "cisco_ios": "show inventory",
+    "cisco_nxos": "show inventory",
+    "aruba_aoscx": "show inventory",
+    "huawei_vrp": "display device",
+    "huawei_yunshan": "display device",
+}
+INTERFACE_COMMANDS = {
+    "cisco_ios": "show interfaces",
+    "cisco_nxos": "show interface",
+    "aruba_aoscx": "show interface",
+    "huawei_vrp": "display interface",
+    "huawei_yunshan": "display interface",
+}
+
+# Compiled TextFSM templates keyed by (platform, command). TextFSM objects keep
+# parser state, so each worker thread gets its own copy.
+_fsm_cache = threading.local()
+
+# Bump whenever detection or the parsed output changes, so stored parses of
+# re-uploaded content are not reused across parser versions
+PARSER_VERSION = 2
+
+# Worker processes for CPU-bound parsing, created on first use. Every API process
+# (e.g. each uvicorn worker) starts its own pool, so set PARSE_WORKERS to share the cores
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS") or 0) or os.cpu_count() or 1
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_lock = threading.Lock()
+
 # Cisco-specific CPU patterns
 CISCO_CPU_START_REGEX = 'last 60 minutes'
 CISCO_CPU_END_REGEX = 'last 72 hours'
+CISCO_CPU_COMMAND = 'show processes cpu history'
+# Span after the command searched for the history graph before falling back to the whole file
+CISCO_CPU_SCAN_WINDOW = 64 * 1024
+
+class _DigitsOnlyTable(dict):
+    """str.translate table keeping only ASCII digits; code points past Latin-1 are dropped via __missing__."""
+
+    def __missing__(self, key: int) -> None:
+        return None
+
+# Prefilled for Latin-1 so device output never leaves the C-level lookup
+DIGITS_ONLY_TABLE = _DigitsOnlyTable(
+    (code, code if 0x30 <= code <= 0x39 else None) for code in range(256)
+)
 
 def detect_platform(text: str) -> str:
-    """Detect platform from the full file content with both platform marker and command keyword."""
-    for platform_key, (platform_pattern, required_command_pattern) in ENV_PATTERNS.items():
-        if re.search(platform_pattern, text, re.IGNORECASE):
-            if re.search(required_command_pattern, text, re.IGNORECASE):
-                return platform_key
+    """Detect platform with both platform marker and command keyword, trying the head of the file first."""
+    # Banners sit near the top of a dump; only scan everything when the head is inconclusive
+    if len(text) > PLATFORM_SCAN_WINDOW:
+        platform = match_platform(text[:PLATFORM_SCAN_WINDOW])
+        if platform != "unknown":
+            return platform
+    return match_platform(text)
+
+def match_platform(text: str) -> str:
+    """Match platform markers and command keywords anywhere in the given text."""
+    found_platforms = set()
+    for match in PLATFORM_RE.finditer(text):
+        found_platforms.add(match.lastgroup)
+        if len(found_platforms) == len(PLATFORM_COMMANDS):
+            break
+
+    # Resolve in ENV_PATTERNS priority order, not by position in the text
+    for platform_key, required_command_pattern in PLATFORM_COMMANDS:
+        if platform_key in found_platforms and required_command_pattern.search(text):
+            return platform_key
     return "unknown"
 
+@lru_cache(maxsize=None)
+def resolve_template(platform: str, command: str) -> Optional[str]:
+    """Look up the NTC template file(s) for a platform and command in the template index."""
+    from ntc_templates.parse import _get_template_dir
+    from textfsm import clitable
+
+    template_dir = _get_template_dir()
+    index = clitable.CliTable("index", template_dir).index
+    row_idx = index.GetRowMatch({"Command": command, "Platform": platform})
+    if not row_idx:
+        return None
+    return index.index[row_idx]["Template"]
+
+def get_fsm(platform: str, command: str) -> Optional["TextFSM"]:
+    """Return this thread's compiled TextFSM for a single-template command, or None."""
+    from ntc_templates.parse import _get_template_dir
+    from textfsm import TextFSM
+
+    fsms = getattr(_fsm_cache, "fsms", None)
+    if fsms is None:
+        fsms = _fsm_cache.fsms = {}
+
+    key = (platform, command)
+    if key not in fsms:
+        template = resolve_template(platform, command)
+        if template is None or ":" in template:
+            fsms[key] = None
+        else:
+            with open(os.path.join(_get_template_dir(), template)) as template_file:
+                fsms[key] = TextFSM(template_file)
+    return fsms[key]
+
 def parse_command(platform: str, command: str, data: str) -> List[Dict[str, Any]]:
     """Parses a given command output using NTC templates for the specified platform."""
     try:
-        return parse_output(platform=platform, command=command, data=data)
+        fsm = get_fsm(platform, command)
+        if fsm is None:
+            # Missing or multi-template commands go through ntc_templates' own table merging
+            from ntc_templates.parse import parse_output
+            return parse_output(platform=platform, command=command, data=data)
+
+        fsm.Reset()
+        header = [name.lower() for name in fsm.header]
+        return [dict(zip(header, row)) for row in fsm.ParseText(data)]
     except Exception as e:
         logger.warning(f"Failed to parse command '{command}' for platform '{platform}': {e}")
         return []
 
+def find_cisco_cpu_section(text: str) -> Optional[str]:
+    """Return the CPU history text between the 60-minute and 72-hour markers, looking after the command first."""
+    command_start = text.find(CISCO_CPU_COMMAND)
+    if command_start >= 0:
+        cpu_section = find_between_markers(text, command_start, command_start + CISCO_CPU_SCAN_WINDOW)
+        if cpu_section is not None:
+            return cpu_section
+    return find_between_markers(text, 0, len(text))
+
+def find_between_markers(text: str, start: int, end: int) -> Optional[str]:
+    """Return the text between the first 60-minute marker and the 72-hour marker after it within text[start:end]."""
+    section_start = text.find(CISCO_CPU_START_REGEX, start, end)
+    if section_start < 0:
+        return None
+    section_start += len(CISCO_CPU_START_REGEX)
+
+    section_end = text.find(CISCO_CPU_END_REGEX, section_start, end)
+    if section_end < 0:
+        return None
+    return text[section_start:section_end]
+
 def extract_cisco_cpu_usage(text: str) -> Dict[str, str]:
     """Extract Cisco IOS CPU usage data from 'show processes cpu history'."""
     cpu_data = {"cpu_max": "N/A", "cpu_avg": "N/A"}
 
-    find_cpu = re.search(CISCO_CPU_START_REGEX + '(.*?)' + CISCO_CPU_END_REGEX, text, re.DOTALL)
+    cpu_section = find_cisco_cpu_section(text)
 
-    if find_cpu:
-        cpu_usage_values = []
-        cpu_history_section = (find_cpu.group(1).split("\n", 2)[-1]).rsplit("\n", 13)[0]
+    if cpu_section is not None:
+        # Section body without the two header lines, split into lines only once per use
+        cpu_section_body = cpu_section.split("\n", 2)[-1]
+        cpu_history_lines = cpu_section_body.rsplit("\n", 13)[0].splitlines()
 
-        cpu_first_row = cpu_history_section.splitlines()[-2]
-        cpu_second_row = cpu_history_section.splitlines()[-1]
+        cpu_first_row = cpu_history_lines[-2]
+        cpu_second_row = cpu_history_lines[-1]
 
-        arr_first_row = list(cpu_first_row[4:])
-        arr_second_row = list(cpu_second_row[4:])
+        # Histogram columns: tens digit on the first row, units digit on the second
+        arr_first_row = cpu_first_row[4:]
+        arr_second_row = cpu_second_row[4:]
 
+        # Generators, so the column values are combined, filtered and reduced in a single pass
+        cpu_usage_values = ()
         if not arr_first_row and arr_second_row:
-            cpu_usage_values = [c.strip() for c in arr_second_row if c.strip()]
+            cpu_usage_values = (c for c in arr_second_row if not c.isspace())
         elif arr_first_row and arr_second_row:
-            for i in range(min(len(arr_first_row), len(arr_second_row))):
-                combined_char = arr_first_row[i] + arr_second_row[i]
-                cpu_usage_values.append(combined_char.strip())
+            cpu_usage_values = ((tens + units).strip() for tens, units in zip(arr_first_row, arr_second_row))
 
         try:
-            valid_cpu_values = [int(val) for val in cpu_usage_values if val.isdigit()]
-            if valid_cpu_values:
-                cpu_data["cpu_max"] = str(max(valid_cpu_values))
+            cpu_max = max((int(val) for val in cpu_usage_values if val.isdigit()), default=None)
+            if cpu_max is not None:
+                cpu_data["cpu_max"] = str(cpu_max)
             else:
                 cpu_data["cpu_max"] = "No numeric CPU max found"
         except ValueError:
             cpu_data["cpu_max"] = "Error parsing CPU max"
-            logger.warning(f"Error converting Cisco CPU max value to int: {cpu_usage_values}")
+            logger.warning(f"Error converting Cisco CPU max value to int: {cpu_first_row!r} / {cpu_second_row!r}")
 
-        cpu_row_avg_section = ((find_cpu.group(1).split("\n", 2)[-1]).rsplit("\n", 3)[0]).splitlines()[-10:]
+        cpu_row_avg_section = cpu_section_body.rsplit("\n", 3)[0].splitlines()[-10:]
         avg_raw_line = [i for i in cpu_row_avg_section if '#' in i]
 
         if avg_raw_line:
-            extracted_avg = re.sub("[^0-9]", "", avg_raw_line[0])
-            try:
-                numeric_avg = int(extracted_avg)
-                if numeric_avg < 10:
-                    cpu_data["cpu_avg"] = "1"
-                else:
-                    cpu_data["cpu_avg"] = str(numeric_avg)
-            except ValueError:
+            extracted_avg = avg_raw_line[0].translate(DIGITS_ONLY_TABLE)
+            if extracted_avg:
+                # Only ASCII digits are left, so normalise the string instead of round-tripping through int()
+                normalized_avg = extracted_avg.lstrip("0") or "0"
+                cpu_data["cpu_avg"] = normalized_avg if len(normalized_avg) > 1 else "1"
+            else:
                 cpu_data["cpu_avg"] = "Error parsing average CPU"
                 logger.warning(f"Error converting Cisco average CPU value to int: {extracted_avg}")
         else:
@@ -128,23 +288,34 @@ def extract_cisco_cpu_usage(text: str) -> Dict[str, str]:
 
     return cpu_data
 
+def to_int(value: Any) -> Optional[int]:
+    """Convert a parsed counter to int, or return None when it is not a plain decimal number."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        # isdecimal() accepts exactly the digits int() does, so no exception path is needed
+        if value.isdecimal():
+            return int(value)
+    return None
+
 def calculate_cisco_memory_usage(memory_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate memory usage percentage from parsed Cisco memory data."""
     if not isinstance(memory_data, dict):
         return {"memory_usage_percent": "N/A"}
 
-    try:
-        memory_total = int(memory_data.get("memory_total", 0))
-        memory_used = int(memory_data.get("memory_used", 0))
-        if memory_total == 0:
-            memory_percent = 0
-        else:
-            memory_percent = round((memory_used / memory_total) * 100, 2)
-        return {"memory_usage_percent": memory_percent}
-    except (KeyError, ValueError, TypeError) as e:
-        logger.error(f"Error calculating Cisco memory usage: {e}, data: {memory_data}")
+    memory_total = to_int(memory_data.get("memory_total", 0))
+    memory_used = to_int(memory_data.get("memory_used", 0))
+    if memory_total is None or memory_used is None:
+        logger.error(f"Error calculating Cisco memory usage: non-numeric memory value, data: {memory_data}")
         return {"memory_usage_percent": "N/A"}
 
+    if memory_total == 0:
+        memory_percent = 0
+    else:
+        memory_percent = round((memory_used / memory_total) * 100, 2)
+    return {"memory_usage_percent": memory_percent}
+
 def process_aruba_system_data(system_data: Dict[str, Any]) -> Dict[str, str]:
     """Process parsed 'show system' output from Aruba to extract CPU and Memory."""
     result = {
@@ -192,39 +363,95 @@ def process_huawei_memory_data(memory_data: Dict[str, Any]) -> Dict[str, str]:
     if not isinstance(memory_data, dict):
         return result
 
-    try:
-        memory_total = int(memory_data.get("total_memory", memory_data.get("memory_total", 0)))
-        memory_used = int(memory_data.get("used_memory", memory_data.get("memory_used", 0)))
-        if memory_total > 0:
-            memory_percent = round((memory_used / memory_total) * 100, 2)
-            result["memory_usage_percent"] = memory_percent
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Error processing Huawei memory data: {e}, data: {memory_data}")
+    memory_total = to_int(memory_data.get("total_memory", memory_data.get("memory_total", 0)))
+    memory_used = to_int(memory_data.get("used_memory", memory_data.get("memory_used", 0)))
+    if memory_total is None or memory_used is None:
+        logger.warning(f"Error processing Huawei memory data: non-numeric memory value, data: {memory_data}")
+    elif memory_total > 0:
+        memory_percent = round((memory_used / memory_total) * 100, 2)
+        result["memory_usage_percent"] = memory_percent
 
     return result
 
+def deduplicate_list(items: List[Any]) -> List[Any]:
+    """Drop repeated entries from a list, keeping the first; dict entries compare by their items."""
+    if not any(isinstance(item, dict) for item in items):
+        return list(dict.fromkeys(items))
+
+    seen = set()
+    deduplicated_list = []
+    for item in items:
+        item_key = frozenset(item.items()) if isinstance(item, dict) else item
+        if item_key not in seen:
+            seen.add(item_key)
+            deduplicated_list.append(item)
+    return deduplicated_list
+
 def deduplicate_serial_and_hardware(data: Any) -> None:
-    """Recursively deduplicates 'serial' and 'hardware' lists within the parsed data."""
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key.lower() in ["serial", "hardware"] and isinstance(value, list):
-                seen = set()
-                deduplicated_list = []
-                for item in value:
-                    if isinstance(item, dict):
-                        item_hash = tuple(sorted(item.items()))
-                        if item_hash not in seen:
-                            seen.add(item_hash)
-                            deduplicated_list.append(item)
-                    elif item not in seen:
-                        seen.add(item)
-                        deduplicated_list.append(item)
-                data[key] = deduplicated_list
-            else:
-                deduplicate_serial_and_hardware(value)
-    elif isinstance(data, list):
-        for item in data:
-            deduplicate_serial_and_hardware(item)
+    """Deduplicates 'serial' and 'hardware' lists anywhere within the parsed data."""
+    # Walk the tree with an explicit stack instead of recursing once per node
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in DEDUP_KEYS and isinstance(value, list):
+                    node[key] = deduplicate_list(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+
+def first_row(parsed_data: Dict[str, Any], command: str) -> Optional[Dict[str, Any]]:
+    """Return the first parsed row of a command, or None when the command produced nothing usable."""
+    rows = parsed_data.get(command)
+    if rows and isinstance(rows, list) and rows[0]:
+        return rows[0]
+    return None
+
+def postprocess_cisco_ios(file_content: str, parsed_data: Dict[str, Any], cpu_mem_data: Dict[str, Any]) -> None:
+    """Fill Cisco IOS CPU (from the raw CPU history) and memory usage."""
+    # Cisco CPU: Use regex on raw text
+    cisco_cpu_results = extract_cisco_cpu_usage(file_content)
+    cpu_mem_data.update(cisco_cpu_results)
+
+    # Cisco Memory: Use TextFSM parsed data then calculate
+    if (memory_row := first_row(parsed_data, "show processes memory sorted")) is not None:
+        calculated_mem = calculate_cisco_memory_usage(memory_row)
+        cpu_mem_data["memory_usage_percent"] = calculated_mem.get("memory_usage_percent")
+
+def postprocess_cisco_nxos(file_content: str, parsed_data: Dict[str, Any], cpu_mem_data: Dict[str, Any]) -> None:
+    """Fill Cisco NX-OS CPU and memory usage from 'show system resources'."""
+    if (sys_data := first_row(parsed_data, "show system resources")) is not None:
+        if "cpu_usage_percent" in sys_data:
+            cpu_mem_data["cpu_avg"] = str(sys_data["cpu_usage_percent"])
+            cpu_mem_data["cpu_max"] = str(sys_data["cpu_usage_percent"])
+        if "memory_usage_percent" in sys_data:
+            cpu_mem_data["memory_usage_percent"] = str(sys_data["memory_usage_percent"])
+
+def postprocess_aruba_aoscx(file_content: str, parsed_data: Dict[str, Any], cpu_mem_data: Dict[str, Any]) -> None:
+    """Fill Aruba CPU and memory usage, both from 'show system'."""
+    if (system_row := first_row(parsed_data, "show system")) is not None:
+        aruba_cpu_mem_results = process_aruba_system_data(system_row)
+        cpu_mem_data.update(aruba_cpu_mem_results)
+
+def postprocess_huawei(file_content: str, parsed_data: Dict[str, Any], cpu_mem_data: Dict[str, Any]) -> None:
+    """Fill Huawei CPU and memory usage from 'display cpu-usage' and 'display memory usage'."""
+    if (cpu_usage_row := first_row(parsed_data, "display cpu-usage")) is not None:
+        huawei_cpu_results = process_huawei_cpu_data(cpu_usage_row)
+        cpu_mem_data.update(huawei_cpu_results)
+
+    if (memory_usage_row := first_row(parsed_data, "display memory usage")) is not None:
+        huawei_mem_results = process_huawei_memory_data(memory_usage_row)
+        cpu_mem_data.update(huawei_mem_results)
+
+# CPU/memory post-processing per platform, run after the TextFSM pass
+PLATFORM_POSTPROCESS = {
+    "cisco_ios": postprocess_cisco_ios,
+    "cisco_nxos": postprocess_cisco_nxos,
+    "aruba_aoscx": postprocess_aruba_aoscx,
+    **dict.fromkeys(HUAWEI_PLATFORMS, postprocess_huawei),
+}
 
 def parse_network_file(file_content: str, filename: str) -> Dict[str, Any]:
     """Parse network device file and return structured data."""
@@ -252,51 +479,9 @@ def parse_network_file(file_content: str, filename: str) -> Dict[str, Any]:
         logger.debug(f"Parsed '{command}' for {filename}: {parsed_output}")
 
     # Extract/Calculate CPU & Memory based on platform and parsed data
-    if device_platform == "cisco_ios":
-        # Cisco CPU: Use regex on raw text
-        cisco_cpu_results = extract_cisco_cpu_usage(file_content)
-        device_specific_cpu_mem_data.update(cisco_cpu_results)
-
-        # Cisco Memory: Use TextFSM parsed data then calculate
-        memory_list = parsed_data_for_file.get("show processes memory sorted", [])
-        if memory_list and isinstance(memory_list, list) and memory_list[0]:
-            calculated_mem = calculate_cisco_memory_usage(memory_list[0])
-            device_specific_cpu_mem_data["memory_usage_percent"] = calculated_mem.get("memory_usage_percent")
-            parsed_data_for_file["show processes memory sorted"][0].update(calculated_mem)
-
-    elif device_platform == "cisco_nxos":
-        # Cisco NX-OS: Extract from system resources
-        system_resources = parsed_data_for_file.get("show system resources", [])
-        if system_resources and isinstance(system_resources, list) and system_resources[0]:
-            sys_data = system_resources[0]
-            if "cpu_usage_percent" in sys_data:
-                device_specific_cpu_mem_data["cpu_avg"] = str(sys_data["cpu_usage_percent"])
-                device_specific_cpu_mem_data["cpu_max"] = str(sys_data["cpu_usage_percent"])
-            if "memory_usage_percent" in sys_data:
-                device_specific_cpu_mem_data["memory_usage_percent"] = str(sys_data["memory_usage_percent"])
-
-    elif device_platform == "aruba_aoscx":
-        # Aruba CPU & Memory: Both from 'show system' TextFSM parsed data
-        system_list = parsed_data_for_file.get("show system", [])
-        if system_list and isinstance(system_list, list) and system_list[0]:
-            aruba_cpu_mem_results = process_aruba_system_data(system_list[0])
-            device_specific_cpu_mem_data.update(aruba_cpu_mem_results)
-            parsed_data_for_file["show system"][0].update(aruba_cpu_mem_results)
-
-    elif device_platform in ["huawei_vrp", "huawei_yunshan"]:
-        # Huawei CPU: From 'display cpu-usage' TextFSM parsed data
-        cpu_usage_list = parsed_data_for_file.get("display cpu-usage", [])
-        if cpu_usage_list and isinstance(cpu_usage_list, list) and cpu_usage_list[0]:
-            huawei_cpu_results = process_huawei_cpu_data(cpu_usage_list[0])
-            device_specific_cpu_mem_data.update(huawei_cpu_results)
-            parsed_data_for_file["display cpu-usage"][0].update(huawei_cpu_results)
-
-        # Huawei Memory: From 'display memory usage' TextFSM parsed data
-        memory_usage_list = parsed_data_for_file.get("display memory usage", [])
-        if memory_usage_list and isinstance(memory_usage_list, list) and memory_usage_list[0]:
-            huawei_mem_results = process_huawei_memory_data(memory_usage_list[0])
-            device_specific_cpu_mem_data.update(huawei_mem_results)
-            parsed_data_for_file["display memory usage"][0].update(huawei_mem_results)
+    postprocess = PLATFORM_POSTPROCESS.get(device_platform)
+    if postprocess:
+        postprocess(file_content, parsed_data_for_file, device_specific_cpu_mem_data)
 
     # Deduplicate serial/hardware and store combined CPU/Memory data
     deduplicate_serial_and_hardware(parsed_data_for_file)
@@ -305,4 +490,64 @@ def parse_network_file(file_content: str, filename: str) -> Dict[str, Any]:
     return {
         "model": device_platform,
         "data": parsed_data_for_file
+    }
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool used to parse files outside the calling process."""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # spawn: the API process runs threads, which fork() does not copy safely
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_executor
+
+def reset_parse_executor(broken_executor: ProcessPoolExecutor) -> None:
+    """Discard a pool left broken by a dead worker, so the next get_parse_executor() starts a fresh one."""
+    global _parse_executor
+    with _parse_executor_lock:
+        # Another caller may already have replaced it
+        if _parse_executor is broken_executor:
+            _parse_executor = None
+    broken_executor.shutdown(wait=False)
+
+def _parse_file(file: Tuple[str, str]) -> Dict[str, Any]:
+    file_content, filename = file
+    return parse_network_file(file_content, filename)
+
+def parse_many(files: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Parse a batch of (file_content, filename) pairs across worker processes, preserving order."""
+    if len(files) < 2:
+        return [_parse_file(file) for file in files]
+
+    # A worker killed mid-batch (OOM, segfault) breaks the whole pool; retry once in a fresh one
+    for attempt in range(2):
+        executor = get_parse_executor()
+        try:
+            return list(executor.map(_parse_file, files, chunksize=4))
+        except BrokenProcessPool:
+            reset_parse_executor(executor)
+            if attempt:
+                raise
+            logger.warning("Parse worker died, retrying the batch in a new process pool")
+
+def build_result_views(device_platform: str, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the small per-view documents served by the read endpoints from parsed data."""
+    version_data = {}
+    version_list = parsed_data.get(VERSION_COMMANDS.get(device_platform))
+    if version_list and isinstance(version_list, list):
+        # Clean up string values
+        version_data = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in version_list[0].items()
+        }
+    version_data["platform_name"] = device_platform
+
+    return {
+        "summary_json": version_data,
+        "cpu_memory_json": parsed_data.get("Calculated_CPU_Memory"),
+        "inventory_json": parsed_data.get(INVENTORY_COMMANDS.get(device_platform)),
+        "interfaces_json": parsed_data.get(INTERFACE_COMMANDS.get(device_platform)),
     }
\ No newline at end of file
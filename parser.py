@@ -4,12 +4,24 @@ import json
 from django.shortcuts import render, redirect
 from django.conf import settings
 from .forms import MultiFileUploadForm
-from ntc_templates.parse import parse_output
+from ntc_templates.parse import parse_output, _get_template_dir
+from textfsm import TextFSM, clitable
+from functools import lru_cache
 from activity_log.utils import log_activity
 from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from django.http import FileResponse, Http404, HttpResponse
+import django
+import threading
+import multiprocessing
 import logging # Add this line at the top of your file if not already present.
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is not installed
+    orjson = None
+
 # Configure logging if not already configured (optional, but good practice)
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -20,6 +32,36 @@ if not logger.handlers:
 # Set NTC_TEMPLATES_DIR environment variable to point to your parser_app/templates directory
 os.environ["NTC_TEMPLATES_DIR"] = os.path.join(settings.BASE_DIR, "parser_app", "templates")
 ALLOWED_EXTENSIONS = [".txt", ".log"]
+# Read uploads 1 MiB at a time instead of Django's 64 KiB default
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Saves raw uploads to disk while the in-memory copy is being parsed; one worker keeps writes in upload order
+UPLOAD_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-writer")
+
+# Shared, lazily started pool for per-file parsing. Every server process starts its own pool,
+# so set PARSE_WORKERS in settings to share the cores between several workers
+PARSE_WORKERS = getattr(settings, "PARSE_WORKERS", None) or os.cpu_count() or 1
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+# Per-upload sidecar with only the first row of each command, enough for the summary and CPU/memory views
+PARSED_SUMMARY_FILENAME = "parsed_summary.json"
+
+# Per-file parsed results live under this folder, listed in upload order by the index ({filename: relative path})
+PARSED_FILES_DIRNAME = "parsed"
+PARSED_INDEX_FILENAME = "index.json"
+
+# Decoded JSON output per user file path: {path: ((st_mtime_ns, st_size), data)}, least recent first.
+# Bounded by entries and by the summed on-disk size of the cached files; decoded documents take
+# several times their file size, so larger files are not cached at all
+PARSED_OUTPUT_CACHE_SIZE = 32
+PARSED_OUTPUT_CACHE_BYTES = 32 * 1024 * 1024
+_parsed_output_cache = OrderedDict()
+_parsed_output_cache_bytes = 0
+_parsed_output_cache_lock = threading.Lock()
+
+# Compiled TextFSM objects carry parse state, so each thread keeps its own per (platform, command)
+_fsm_cache = threading.local()
 
 # --- Platform Detection Patterns ---
 env_patterns = OrderedDict([
@@ -29,6 +71,29 @@ env_patterns = OrderedDict([
     ("aruba_aoscx", (r"ArubaOS-CX", r"show")),
 ])
 
+# Command keywords shared by several platforms ("show", "display") get one group each
+command_patterns = list(OrderedDict.fromkeys(command for _, command in env_patterns.values()))
+
+# One alternation reporting every platform marker and command keyword in a single pass;
+# compiled for bytes so uploads are detected before (and without) decoding
+DETECT_RE = re.compile(
+    "|".join(
+        [f"(?P<{key}_plat>{platform_pattern})" for key, (platform_pattern, _) in env_patterns.items()]
+        + [f"(?P<cmd{index}>{command})" for index, command in enumerate(command_patterns)]
+    ).encode(),
+    re.IGNORECASE
+)
+DETECT_GROUP_COUNT = len(env_patterns) + len(command_patterns)
+
+# Compiled once at import: (platform_key, platform_group, command_group, command_regex)
+ENV_PATTERNS = [
+    (key, f"{key}_plat", f"cmd{command_patterns.index(command)}", re.compile(command.encode(), re.IGNORECASE))
+    for key, (_, command) in env_patterns.items()
+]
+
+# Leading slice of a file checked for platform banners before the full text
+PLATFORM_SCAN_WINDOW = 64 * 1024
+
 # --- TextFSM Templates Mapping per Platform and Command ---
 textfsm_templates = {
     "cisco_ios": {
@@ -52,26 +117,124 @@ textfsm_templates = {
     },
 }
 
+# Huawei CPU fields, in order of preference
+HUAWEI_CPU_KEYS = ("cpu_usage_rate", "cpu_usage_average", "cpu_usage")
+
+# Keys (compared lowercased) whose list values are deduplicated
+DEDUP_KEYS = frozenset({"serial", "hardware"})
+
+# Command whose output each view shows, per platform
+VERSION_COMMANDS = {
+    "cisco_ios": "show version",
+    "aruba_aoscx": "show system",
+    "huawei_vrp": "display version",
+    "huawei_yunshan": "display version",
+}
+INVENTORY_COMMANDS = {
+    "cisco_ios": "show inventory",
+    "aruba_aoscx": "show inventory",
+    "huawei_vrp": "display device",
+    "huawei_yunshan": "display device",
+}
+INTERFACE_COMMANDS = {
+    "cisco_ios": "show interfaces",
+    "aruba_aoscx": "show interface",
+    "huawei_vrp": "display interface",
+    "huawei_yunshan": "display interface",
+}
+
 # Cisco-specific CPU patterns (regex parsing from 'show processes cpu history')
 CISCO_CPU_START_REGEX = 'last 60 minutes'
 CISCO_CPU_END_REGEX = 'last 72 hours'
+# Everything but ASCII digits, stripped from the average CPU row
+NON_DIGIT_RE = re.compile(r"[^0-9]+")
 
 def detect_platform(text):
-    """Detect platform from the full file content with both platform marker and command keyword."""
-    for platform_key, (platform_pattern, required_command_pattern) in env_patterns.items():
-        if re.search(platform_pattern, text, re.IGNORECASE):
-            if re.search(required_command_pattern, text, re.IGNORECASE):
-                return platform_key
+    """Detect platform from raw upload bytes with both platform marker and command keyword, trying the head of the file first."""
+    # Banners and the first commands sit near the top of a dump; only scan everything when the head is inconclusive
+    if len(text) > PLATFORM_SCAN_WINDOW:
+        platform = match_platform(text[:PLATFORM_SCAN_WINDOW])
+        if platform != "unknown":
+            return platform
+    return match_platform(text)
+
+def match_platform(text):
+    """Match platform markers and command keywords anywhere in the given bytes."""
+    found_groups = set()
+    for match in DETECT_RE.finditer(text):
+        found_groups.add(match.lastgroup)
+        if len(found_groups) == DETECT_GROUP_COUNT:
+            break
+
+    # Resolve in env_patterns priority order; a keyword overlapped by another match is searched directly
+    for platform_key, platform_group, command_group, command_re in ENV_PATTERNS:
+        if platform_group in found_groups and (command_group in found_groups or command_re.search(text)):
+            return platform_key
     return "unknown"
 
+@lru_cache(maxsize=None)
+def resolve_template(platform, command):
+    """Looks up the NTC template file(s) for a platform and command in the template index."""
+    index = clitable.CliTable("index", _get_template_dir()).index
+    row_idx = index.GetRowMatch({"Command": command, "Platform": platform})
+    if not row_idx:
+        return None
+    return index.index[row_idx]["Template"]
+
+def get_fsm(platform, command):
+    """Returns this thread's compiled TextFSM for a single-template command, or None."""
+    fsms = getattr(_fsm_cache, "fsms", None)
+    if fsms is None:
+        fsms = _fsm_cache.fsms = {}
+
+    key = (platform, command)
+    if key not in fsms:
+        template = resolve_template(platform, command)
+        if template is None or ":" in template:
+            fsms[key] = None
+        else:
+            with open(os.path.join(_get_template_dir(), template)) as template_file:
+                fsms[key] = TextFSM(template_file)
+    return fsms[key]
+
 def parse_command(platform, command, data):
     """Parses a given command output using NTC templates for the specified platform."""
     try:
-        return parse_output(platform=platform, command=command, data=data)
+        fsm = get_fsm(platform, command)
+        if fsm is None:
+            # Missing or multi-template commands go through ntc_templates' own table merging
+            return parse_output(platform=platform, command=command, data=data)
+
+        fsm.Reset()
+        header = [name.lower() for name in fsm.header]
+        return [dict(zip(header, row)) for row in fsm.ParseText(data)]
     except Exception as e:
         logger.warning(f"Failed to parse command '{command}' for platform '{platform}': {e}")
         return []
 
+def write_json_file(path, data):
+    """Writes data as indented JSON, using orjson when available."""
+    if orjson is not None:
+        with open(path, "wb") as json_file:
+            json_file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(data, json_file, indent=4)
+
+def replace_json_file(path, data):
+    """Writes JSON to a temporary file and moves it over path, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    write_json_file(tmp_path, data)
+    os.replace(tmp_path, path)
+
+def read_json_file(path):
+    """Reads a JSON file, using orjson when available. Raises json.JSONDecodeError on bad input."""
+    with open(path, "rb") as json_file:
+        raw = json_file.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 def download_json(request):
     """Allows authenticated users to download the parsed JSON output."""
     if not request.user.is_authenticated:
@@ -82,13 +245,30 @@ def download_json(request):
 
     logger.debug(f"Checking for file at: {json_filename}")
 
-    if os.path.exists(json_filename):
+    # Open once instead of checking existence first; a real file object lets the server use wsgi.file_wrapper/sendfile
+    try:
         json_file = open(json_filename, 'rb')
-        return FileResponse(json_file, as_attachment=True, filename='parsed_output.json')
-    else:
+    except FileNotFoundError:
         logger.error("JSON file not found.")
         raise Http404("JSON file not found.")
 
+    response = FileResponse(json_file, as_attachment=True, filename='parsed_output.json')
+    response['Content-Length'] = os.fstat(json_file.fileno()).st_size
+    return response
+
+def find_cisco_cpu_section(text):
+    """Returns the text between the first 60-minute marker and the 72-hour marker after it, or None."""
+    # Two fixed-string scans instead of a lazy DOTALL regex backtracking across the whole file
+    section_start = text.find(CISCO_CPU_START_REGEX)
+    if section_start < 0:
+        return None
+    section_start += len(CISCO_CPU_START_REGEX)
+
+    section_end = text.find(CISCO_CPU_END_REGEX, section_start)
+    if section_end < 0:
+        return None
+    return text[section_start:section_end]
+
 def extract_cisco_cpu_usage(text):
     """
     Extracts Cisco IOS CPU usage data (max and average) from 'show processes cpu history'
@@ -96,40 +276,43 @@ def extract_cisco_cpu_usage(text):
     """
     cpu_data = {"cpu_max": "N/A", "cpu_avg": "N/A"}
 
-    find_cpu = re.search(CISCO_CPU_START_REGEX + '(.*?)' + CISCO_CPU_END_REGEX, text, re.DOTALL)
+    cpu_section = find_cisco_cpu_section(text)
 
-    if find_cpu:
-        cpu_usage_values = []
-        cpu_history_section = (find_cpu.group(1).split("\n", 2)[-1]).rsplit("\n", 13)[0]
+    if cpu_section is not None:
+        # Section body without the two header lines, shared by the max and average lookups
+        cpu_section_body = cpu_section.split("\n", 2)[-1]
+        cpu_history_lines = cpu_section_body.rsplit("\n", 13)[0].splitlines()
 
-        cpu_first_row = cpu_history_section.splitlines()[-2]
-        cpu_second_row = cpu_history_section.splitlines()[-1]
+        cpu_first_row = cpu_history_lines[-2]
+        cpu_second_row = cpu_history_lines[-1]
 
-        arr_first_row = list(cpu_first_row[4:])
-        arr_second_row = list(cpu_second_row[4:])
+        # Histogram columns: tens digit on the first row, units digit on the second
+        arr_first_row = cpu_first_row[4:]
+        arr_second_row = cpu_second_row[4:]
 
+        # map/filter over str methods, so combining, filtering and reducing the columns runs without Python frames;
+        # history rows repeat the same few column values, so only distinct columns are converted
+        cpu_usage_values = ()
         if not arr_first_row and arr_second_row:
-            cpu_usage_values = [c.strip() for c in arr_second_row if c.strip()]
+            cpu_usage_values = set(arr_second_row)
         elif arr_first_row and arr_second_row:
-            for i in range(min(len(arr_first_row), len(arr_second_row))):
-                combined_char = arr_first_row[i] + arr_second_row[i]
-                cpu_usage_values.append(combined_char.strip())
+            cpu_usage_values = map(str.strip, set(map(str.__add__, arr_first_row, arr_second_row)))
 
         try:
-            valid_cpu_values = [int(val) for val in cpu_usage_values if val.isdigit()]
-            if valid_cpu_values:
-                cpu_data["cpu_max"] = str(max(valid_cpu_values))
+            cpu_max = max(map(int, filter(str.isdigit, cpu_usage_values)), default=None)
+            if cpu_max is not None:
+                cpu_data["cpu_max"] = str(cpu_max)
             else:
                 cpu_data["cpu_max"] = "No numeric CPU max found"
         except ValueError:
             cpu_data["cpu_max"] = "Error parsing CPU max"
-            logger.warning(f"Error converting Cisco CPU max value to int: {cpu_usage_values}")
+            logger.warning(f"Error converting Cisco CPU max value to int: {cpu_first_row!r} / {cpu_second_row!r}")
 
-        cpu_row_avg_section = ((find_cpu.group(1).split("\n", 2)[-1]).rsplit("\n", 3)[0]).splitlines()[-10:]
+        cpu_row_avg_section = cpu_section_body.rsplit("\n", 3)[0].splitlines()[-10:]
         avg_raw_line = [i for i in cpu_row_avg_section if '#' in i]
 
         if avg_raw_line:
-            extracted_avg = re.sub("[^0-9]", "", avg_raw_line[0])
+            extracted_avg = NON_DIGIT_RE.sub("", avg_raw_line[0])
             try:
                 numeric_avg = int(extracted_avg)
                 if numeric_avg < 10:
@@ -224,15 +407,20 @@ def process_huawei_cpu_data(cpu_data):
     if not isinstance(cpu_data, dict):
         return result
 
-    cpu_keys = ["cpu_usage_rate", "cpu_usage_average", "cpu_usage"]
-    for key in cpu_keys:
-        if key in cpu_data and str(cpu_data[key]).replace('.', '', 1).isdigit():
-            try:
-                cpu_val = int(float(cpu_data[key]))
-                result["cpu_avg"] = str(cpu_val)
+    for key in HUAWEI_CPU_KEYS:
+        if key not in cpu_data:
+            continue
+        cpu_text = str(cpu_data[key])
+        try:
+            # Whole numbers skip the float round trip; decimals are truncated as before
+            if cpu_text.isdigit():
+                result["cpu_avg"] = str(int(cpu_text))
                 break
-            except ValueError:
-                pass
+            if cpu_text.replace('.', '', 1).isdigit():
+                result["cpu_avg"] = str(int(float(cpu_text)))
+                break
+        except ValueError:
+            pass
     return result
 
 def process_huawei_memory_data(memory_data):
@@ -256,28 +444,183 @@ def process_huawei_memory_data(memory_data):
 
     return result
 
+def deduplicate_list(values):
+    """Returns the list without repeated items, keeping first occurrences in order."""
+    if len(values) <= 1:
+        return values
+
+    seen = set()
+    deduplicated_list = []
+    for item in values:
+        if isinstance(item, dict):
+            # Dicts are unordered, so their items compare as a set; unhashable values fall back to repr
+            try:
+                item_hash = frozenset(item.items())
+            except TypeError:
+                item_hash = tuple(sorted((k, repr(v)) for k, v in item.items()))
+            if item_hash not in seen:
+                seen.add(item_hash)
+                deduplicated_list.append(item)
+        elif item not in seen:
+            seen.add(item)
+            deduplicated_list.append(item)
+    return deduplicated_list
+
 def deduplicate_serial_and_hardware(data):
-    """Recursively deduplicates 'serial' and 'hardware' lists within the parsed data."""
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key.lower() in ["serial", "hardware"] and isinstance(value, list):
-                seen = set()
-                deduplicated_list = []
-                for item in value:
-                    if isinstance(item, dict):
-                        item_hash = tuple(sorted(item.items()))
-                        if item_hash not in seen:
-                            seen.add(item_hash)
-                            deduplicated_list.append(item)
-                    elif item not in seen:
-                        seen.add(item)
-                        deduplicated_list.append(item)
-                data[key] = deduplicated_list
-            else:
-                deduplicate_serial_and_hardware(value)
-    elif isinstance(data, list):
-        for item in data:
-            deduplicate_serial_and_hardware(item)
+    """Deduplicates 'serial' and 'hardware' lists anywhere within the parsed data."""
+    # Explicit worklist instead of recursion: no frame per nested dict/list
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, list) and key.lower() in DEDUP_KEYS:
+                    node[key] = deduplicate_list(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+
+def postprocess_cisco_ios(raw_text_content, parsed_data_for_file, device_specific_cpu_mem_data):
+    """Cisco: CPU from the raw 'show processes cpu history' text, memory from 'show processes memory sorted'."""
+    # Cisco CPU: Use regex on raw text
+    cisco_cpu_results = extract_cisco_cpu_usage(raw_text_content)
+    device_specific_cpu_mem_data.update(cisco_cpu_results)
+
+    # Cisco Memory: Use TextFSM parsed data then calculate
+    memory_list = parsed_data_for_file.get("show processes memory sorted", [])
+    if memory_list and isinstance(memory_list, list) and memory_list[0]:
+        memory_row = memory_list[0]
+        calculated_mem = calculate_cisco_memory_usage(memory_row)
+        device_specific_cpu_mem_data["memory_usage_percent"] = calculated_mem.get("memory_usage_percent")
+        memory_row.update(calculated_mem)
+
+def postprocess_aruba_aoscx(raw_text_content, parsed_data_for_file, device_specific_cpu_mem_data):
+    """Aruba: CPU and memory both from 'show system'."""
+    system_list = parsed_data_for_file.get("show system", [])
+    if system_list and isinstance(system_list, list) and system_list[0]:
+        system_row = system_list[0]
+        aruba_cpu_mem_results = process_aruba_system_data(system_row)
+        device_specific_cpu_mem_data.update(aruba_cpu_mem_results)
+        # Add or ensure this line exists: Update the original parsed data with the extracted values
+        system_row.update(aruba_cpu_mem_results)
+    # else: # Uncomment if you want logging for no system data
+    #     logger.warning("No valid 'show system' data found for aruba_aoscx.")
+
+def postprocess_huawei(raw_text_content, parsed_data_for_file, device_specific_cpu_mem_data):
+    """Huawei VRP and YunShan: CPU from 'display cpu-usage', memory from 'display memory usage'."""
+    cpu_usage_list = parsed_data_for_file.get("display cpu-usage", [])
+    if cpu_usage_list and isinstance(cpu_usage_list, list) and cpu_usage_list[0]:
+        cpu_row = cpu_usage_list[0]
+        huawei_cpu_results = process_huawei_cpu_data(cpu_row)
+        device_specific_cpu_mem_data.update(huawei_cpu_results)
+        cpu_row.update(huawei_cpu_results)
+
+    memory_usage_list = parsed_data_for_file.get("display memory usage", [])
+    if memory_usage_list and isinstance(memory_usage_list, list) and memory_usage_list[0]:
+        memory_row = memory_usage_list[0]
+        huawei_mem_results = process_huawei_memory_data(memory_row)
+        device_specific_cpu_mem_data.update(huawei_mem_results)
+        memory_row.update(huawei_mem_results)
+
+# CPU/memory extraction per platform: handler(raw_text_content, parsed_data_for_file, device_specific_cpu_mem_data)
+PLATFORM_POSTPROCESS = {
+    "cisco_ios": postprocess_cisco_ios,
+    "aruba_aoscx": postprocess_aruba_aoscx,
+    "huawei_vrp": postprocess_huawei,
+    "huawei_yunshan": postprocess_huawei,
+}
+
+def save_upload(file_path, raw_bytes):
+    """Writes the raw bytes of an uploaded file to the user's folder."""
+    with open(file_path, "wb") as f:
+        f.write(raw_bytes)
+    logger.info(f"Saved uploaded file: {os.path.basename(file_path)}")
+
+def decode_upload(raw_bytes):
+    """Decodes an upload the way text-mode open() would, including universal newlines."""
+    text = raw_bytes.decode("utf8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def parse_uploaded_file(filename, raw_bytes):
+    """Detects the platform of one uploaded file and parses it into {"model", "data"}."""
+    device_platform = detect_platform(raw_bytes)
+    parsed_data_for_file = {}
+    device_specific_cpu_mem_data = {"cpu_max": "N/A", "cpu_avg": "N/A", "memory_usage_percent": "N/A"}
+
+    platform_specific_templates = textfsm_templates.get(device_platform, {})
+
+    if not platform_specific_templates:
+        logger.warning(f"No TextFSM templates found for detected platform: '{device_platform}' for file '{filename}'")
+        return {
+            "model": device_platform,
+            "data": {"Error": f"No templates configured for {device_platform}"},
+        }
+
+    # Only files that will be parsed are decoded; TextFSM and the CPU history work on text
+    raw_text_content = decode_upload(raw_bytes)
+
+    # --- Step 1: Parse all commands using TextFSM for the detected platform ---
+    for command, template_name in platform_specific_templates.items():
+        parsed_output = parse_command(device_platform, command, raw_text_content)
+        parsed_data_for_file[command] = parsed_output
+        logger.debug(f"Parsed '{command}' for {filename}: {parsed_output}")
+
+    # --- Step 2: Extract/Calculate CPU & Memory based on platform and parsed data ---
+    postprocess = PLATFORM_POSTPROCESS.get(device_platform)
+    if postprocess is not None:
+        postprocess(raw_text_content, parsed_data_for_file, device_specific_cpu_mem_data)
+
+    # --- Step 3: Deduplicate serial/hardware and store combined CPU/Memory data ---
+    deduplicate_serial_and_hardware(parsed_data_for_file)
+    parsed_data_for_file["Calculated_CPU_Memory"] = device_specific_cpu_mem_data
+
+    return {
+        "model": device_platform,
+        "data": parsed_data_for_file,
+    }
+
+def get_parse_executor():
+    """Returns the shared process pool used to parse uploads outside the request worker."""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # spawn: the server process runs threads, which fork() does not copy safely;
+            # workers set up Django so this module can be imported to unpickle tasks
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return _parse_executor
+
+def reset_parse_executor(broken_executor):
+    """Discards a pool left broken by a dead worker, so the next get_parse_executor() starts a fresh one."""
+    global _parse_executor
+    with _parse_executor_lock:
+        # Another request may already have replaced it
+        if _parse_executor is broken_executor:
+            _parse_executor = None
+    broken_executor.shutdown(wait=False)
+
+def parse_many(uploads):
+    """Parses (filename, raw_bytes) pairs across worker processes, preserving order."""
+    if len(uploads) < 2:
+        return [parse_uploaded_file(filename, raw_bytes) for filename, raw_bytes in uploads]
+    filenames, raw_contents = zip(*uploads)
+
+    # A worker killed mid-batch (OOM, segfault) breaks the whole pool; retry once in a fresh one
+    for attempt in range(2):
+        executor = get_parse_executor()
+        try:
+            return list(executor.map(parse_uploaded_file, filenames, raw_contents))
+        except BrokenProcessPool:
+            reset_parse_executor(executor)
+            if attempt:
+                raise
+            logger.warning("Parse worker died, retrying the upload in a new process pool")
 
 def upload_file(request):
     """Handles file uploads, parses them, and stores the structured data."""
@@ -293,6 +636,8 @@ def upload_file(request):
         if form.is_valid():
             uploaded_files = request.FILES.getlist("files")
             parsed_results = {}
+            pending_saves = []
+            uploads = []
 
             for uploaded_file in uploaded_files:
                 file_extension = os.path.splitext(uploaded_file.name)[1].lower()
@@ -300,103 +645,46 @@ def upload_file(request):
                     logger.warning(f"Skipping unsupported file extension: {uploaded_file.name}")
                     continue
 
+                # Read the upload once; the disk copy is written in the background from the same bytes
                 file_path = os.path.join(user_folder, uploaded_file.name)
-                with open(file_path, "wb") as f:
-                    for chunk in uploaded_file.chunks():
-                        f.write(chunk)
-                logger.info(f"Saved uploaded file: {uploaded_file.name}")
-
-                with open(file_path, "r", encoding="utf8", errors="ignore") as f:
-                    raw_text_content = f.read()
-
-                device_platform = detect_platform(raw_text_content)
-                parsed_data_for_file = {}
-                device_specific_cpu_mem_data = {"cpu_max": "N/A", "cpu_avg": "N/A", "memory_usage_percent": "N/A"}
-
-                platform_specific_templates = textfsm_templates.get(device_platform, {})
-
-                if not platform_specific_templates:
-                    logger.warning(f"No TextFSM templates found for detected platform: '{device_platform}' for file '{uploaded_file.name}'")
-                    parsed_results[uploaded_file.name] = {
-                        "model": device_platform,
-                        "data": {"Error": f"No templates configured for {device_platform}"},
-                    }
-                    continue
-
-                # --- Step 1: Parse all commands using TextFSM for the detected platform ---
-                for command, template_name in platform_specific_templates.items():
-                    parsed_output = parse_command(device_platform, command, raw_text_content)
-                    parsed_data_for_file[command] = parsed_output
-                    logger.debug(f"Parsed '{command}' for {uploaded_file.name}: {parsed_output}")
-
-                # --- Step 2: Extract/Calculate CPU & Memory based on platform and parsed data ---
-                if device_platform == "cisco_ios":
-                    # Cisco CPU: Use regex on raw text
-                    cisco_cpu_results = extract_cisco_cpu_usage(raw_text_content)
-                    device_specific_cpu_mem_data.update(cisco_cpu_results)
-
-                    # Cisco Memory: Use TextFSM parsed data then calculate
-                    memory_list = parsed_data_for_file.get("show processes memory sorted", [])
-                    if memory_list and isinstance(memory_list, list) and memory_list[0]:
-                        calculated_mem = calculate_cisco_memory_usage(memory_list[0])
-                        device_specific_cpu_mem_data["memory_usage_percent"] = calculated_mem.get("memory_usage_percent")
-                        parsed_data_for_file["show processes memory sorted"][0].update(calculated_mem)
-
-                elif device_platform == "aruba_aoscx":
-                    # Aruba CPU & Memory: Both from 'show system' TextFSM parsed data
-                    system_list = parsed_data_for_file.get("show system", [])
-                    if system_list and isinstance(system_list, list) and system_list[0]:
-                        aruba_cpu_mem_results = process_aruba_system_data(system_list[0])
-                        device_specific_cpu_mem_data.update(aruba_cpu_mem_results)
-                        # Add or ensure this line exists: Update the original parsed data with the extracted values
-                        parsed_data_for_file["show system"][0].update(aruba_cpu_mem_results)
-                    # else: # Uncomment if you want logging for no system data
-                    #     logger.warning("No valid 'show system' data found for aruba_aoscx.")
-
-                elif device_platform == "huawei_vrp":
-                    # Huawei CPU: From 'display cpu-usage' TextFSM parsed data
-                    cpu_usage_list = parsed_data_for_file.get("display cpu-usage", [])
-                    if cpu_usage_list and isinstance(cpu_usage_list, list) and cpu_usage_list[0]:
-                        huawei_cpu_results = process_huawei_cpu_data(cpu_usage_list[0])
-                        device_specific_cpu_mem_data.update(huawei_cpu_results)
-                        parsed_data_for_file["display cpu-usage"][0].update(huawei_cpu_results)
-
-                    # Huawei Memory: From 'display memory usage' TextFSM parsed data
-                    memory_usage_list = parsed_data_for_file.get("display memory usage", [])
-                    if memory_usage_list and isinstance(memory_usage_list, list) and memory_usage_list[0]:
-                        huawei_mem_results = process_huawei_memory_data(memory_usage_list[0])
-                        device_specific_cpu_mem_data.update(huawei_mem_results)
-                        parsed_data_for_file["display memory usage"][0].update(huawei_mem_results)
-                        
-                elif device_platform == "huawei_yunshan":
-                    # Huawei CPU: From 'display cpu-usage' TextFSM parsed data
-                    cpu_usage_list = parsed_data_for_file.get("display cpu-usage", [])
-                    if cpu_usage_list and isinstance(cpu_usage_list, list) and cpu_usage_list[0]:
-                        huawei_cpu_results = process_huawei_cpu_data(cpu_usage_list[0])
-                        device_specific_cpu_mem_data.update(huawei_cpu_results)
-                        parsed_data_for_file["display cpu-usage"][0].update(huawei_cpu_results)
-
-                    # Huawei Memory: From 'display memory usage' TextFSM parsed data
-                    memory_usage_list = parsed_data_for_file.get("display memory usage", [])
-                    if memory_usage_list and isinstance(memory_usage_list, list) and memory_usage_list[0]:
-                        huawei_mem_results = process_huawei_memory_data(memory_usage_list[0])
-                        device_specific_cpu_mem_data.update(huawei_mem_results)
-                        parsed_data_for_file["display memory usage"][0].update(huawei_mem_results)
-
-                # --- Step 3: Deduplicate serial/hardware and store combined CPU/Memory data ---
-                deduplicate_serial_and_hardware(parsed_data_for_file)
-                parsed_data_for_file["Calculated_CPU_Memory"] = device_specific_cpu_mem_data
-
-                parsed_results[uploaded_file.name] = {
-                    "model": device_platform,
-                    "data": parsed_data_for_file,
-                }
+                raw_bytes = b"".join(uploaded_file.chunks(chunk_size=UPLOAD_CHUNK_SIZE))
+                pending_saves.append(UPLOAD_WRITER.submit(save_upload, file_path, raw_bytes))
+                uploads.append((uploaded_file.name, raw_bytes))
+
+            # Files are independent, so they are parsed in parallel and collected in upload order
+            parsed_folder = os.path.join(user_folder, PARSED_FILES_DIRNAME)
+            os.makedirs(parsed_folder, exist_ok=True)
+            parsed_index = {}
+            for (filename, _), parsed_result in zip(uploads, parse_many(uploads)):
+                parsed_results[filename] = parsed_result
+
+                # One JSON per device, so the per-device views only decode the device they show
+                parsed_index[filename] = os.path.join(PARSED_FILES_DIRNAME, os.path.basename(filename) + ".json")
+                parsed_file_path = os.path.join(user_folder, parsed_index[filename])
+                write_json_file(parsed_file_path, parsed_result)
+                forget_parsed_output(parsed_file_path)
+
+            # Surface any write error before reporting the upload as done
+            for pending_save in pending_saves:
+                pending_save.result()
 
             uploaded_names = ", ".join([f.name for f in uploaded_files])
             log_activity(request.user, f"Uploaded files: {uploaded_names}")
 
-            with open(json_filename, "w", encoding="utf-8") as json_file:
-                json.dump(parsed_results, json_file, indent=4)
+            write_json_file(json_filename, parsed_results)
+            forget_parsed_output(json_filename)
+
+            summary_filename = os.path.join(user_folder, PARSED_SUMMARY_FILENAME)
+            write_json_file(summary_filename, {
+                filename: summarize_parsed_result(details) for filename, details in parsed_results.items()
+            })
+            forget_parsed_output(summary_filename)
+
+            # The index goes last and replaces the previous batch, as parsed_output.json does
+            index_filename = os.path.join(user_folder, PARSED_INDEX_FILENAME)
+            replace_json_file(index_filename, parsed_index)
+            forget_parsed_output(index_filename)
+            remove_unindexed_results(user_folder, parsed_index)
 
             return redirect("summary_view")
 
@@ -405,23 +693,101 @@ def upload_file(request):
 
     return render(request, "parser_app/upload.html", {"form": form})
 
-def load_data(request):
-    """Loads parsed data from the user's JSON file."""
+def remove_unindexed_results(user_folder, parsed_index):
+    """Deletes per-file results left over from earlier upload batches."""
+    indexed_paths = set(parsed_index.values())
+    parsed_folder = os.path.join(user_folder, PARSED_FILES_DIRNAME)
+    for name in os.listdir(parsed_folder):
+        relative_path = os.path.join(PARSED_FILES_DIRNAME, name)
+        if relative_path not in indexed_paths and name.endswith(".json"):
+            os.remove(os.path.join(user_folder, relative_path))
+            forget_parsed_output(os.path.join(user_folder, relative_path))
+
+def load_selected_results(request, hostname_filter):
+    """Returns every uploaded filename and the (filename, details) pairs to display, all of them without a filter."""
+    parsed_index = load_data(request, PARSED_INDEX_FILENAME)
+    if not parsed_index:
+        # Uploads from before the per-file results existed only have the full output
+        parsed_data = load_data(request)
+        selected_results = [
+            (filename, details) for filename, details in parsed_data.items()
+            if not hostname_filter or hostname_filter == filename
+        ]
+        return list(parsed_data.keys()), selected_results
+
+    selected_filenames = [hostname_filter] if hostname_filter else parsed_index.keys()
+    selected_results = [
+        (filename, load_data(request, parsed_index[filename]))
+        for filename in selected_filenames if filename in parsed_index
+    ]
+    return list(parsed_index.keys()), selected_results
+
+def summarize_parsed_result(details):
+    """Reduces one file's parsed result to its model, the first row of each command and the calculated CPU/memory."""
+    return {
+        "model": details["model"],
+        "data": {
+            command: value[:1] if isinstance(value, list) else value
+            for command, value in details["data"].items()
+        },
+    }
+
+def load_data(request, json_name="parsed_output.json"):
+    """Loads parsed data from one of the user's JSON files."""
     user_folder = os.path.join(settings.MEDIA_ROOT, request.user.username)
-    json_file_path = os.path.join(user_folder, "parsed_output.json")
+    json_file_path = os.path.join(user_folder, json_name)
 
-    if os.path.exists(json_file_path):
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError as e:
-                logger.error(f"Error decoding JSON file {json_file_path}: {e}")
-                return {}
-    return {}
+    try:
+        file_stat = os.stat(json_file_path)
+    except FileNotFoundError:
+        return {}
+
+    # A rewrite changes mtime or size, so a matching signature means the cached copy is current
+    signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    with _parsed_output_cache_lock:
+        cached = _parsed_output_cache.get(json_file_path)
+        if cached is not None and cached[0] == signature:
+            _parsed_output_cache.move_to_end(json_file_path)
+            return cached[1]
+
+    try:
+        data = read_json_file(json_file_path)
+    except json.JSONDecodeError as e:
+        logger.error(f"Error decoding JSON file {json_file_path}: {e}")
+        return {}
+
+    if file_stat.st_size <= PARSED_OUTPUT_CACHE_BYTES:
+        cache_parsed_output(json_file_path, signature, data)
+    return data
+
+def cache_parsed_output(json_file_path, signature, data):
+    """Caches decoded output, evicting least recently used files until both limits hold."""
+    global _parsed_output_cache_bytes
+    with _parsed_output_cache_lock:
+        previous = _parsed_output_cache.pop(json_file_path, None)
+        if previous is not None:
+            _parsed_output_cache_bytes -= previous[0][1]
+        _parsed_output_cache[json_file_path] = (signature, data)
+        _parsed_output_cache_bytes += signature[1]
+        while (
+            len(_parsed_output_cache) > PARSED_OUTPUT_CACHE_SIZE
+            or _parsed_output_cache_bytes > PARSED_OUTPUT_CACHE_BYTES
+        ):
+            _, (evicted_signature, _) = _parsed_output_cache.popitem(last=False)
+            _parsed_output_cache_bytes -= evicted_signature[1]
+
+def forget_parsed_output(json_file_path):
+    """Drops a user's cached parsed output after it has been rewritten."""
+    global _parsed_output_cache_bytes
+    with _parsed_output_cache_lock:
+        previous = _parsed_output_cache.pop(json_file_path, None)
+        if previous is not None:
+            _parsed_output_cache_bytes -= previous[0][1]
 
 def summary_view(request):
     """Displays a summary view for uploaded devices, including version information."""
-    parsed_data = load_data(request)
+    # Uploads from before the summary sidecar existed only have the full output
+    parsed_data = load_data(request, PARSED_SUMMARY_FILENAME) or load_data(request)
 
     if not parsed_data:
         return redirect("upload_file")
@@ -431,24 +797,17 @@ def summary_view(request):
         device_platform = details.get("model", "unknown")
         version_data = {}
 
-        version_list = []
-        if device_platform == "cisco_ios":
-            version_list = details.get("data", {}).get("show version", [])
-        elif device_platform == "aruba_aoscx":
-            version_list = details.get("data", {}).get("show system", [])
-        elif device_platform == "huawei_vrp":
-            version_list = details.get("data", {}).get("display version", [])
-        elif device_platform == "huawei_yunshan":
-            version_list = details.get("data", {}).get("display version", [])
+        command = VERSION_COMMANDS.get(device_platform)
+        version_list = details.get("data", {}).get(command, []) if command else []
 
         if version_list and isinstance(version_list, list) and version_list[0]:
-            version_data = version_list[0]
-            
             # OPTIONAL CLEANUP: Strip whitespace from string values
             # This is good practice as your JSON shows trailing spaces for hardware and uptime
-            for key, value in version_data.items():
-                if isinstance(value, str):
-                    version_data[key] = value.strip()
+            # Built as a copy: load_data returns the cached document shared by later requests
+            version_data = {
+                key: value.strip() if isinstance(value, str) else value
+                for key, value in version_list[0].items()
+            }
 
         else:
             logger.warning(f"No valid version data found or parsed for {filename} (Platform: {device_platform})")
@@ -465,7 +824,8 @@ def summary_view(request):
 
 def cpu_memory_usage_view(request):
     """Displays combined CPU and Memory usage for all uploaded devices."""
-    parsed_data = load_data(request)
+    # Uploads from before the summary sidecar existed only have the full output
+    parsed_data = load_data(request, PARSED_SUMMARY_FILENAME) or load_data(request)
 
     if not parsed_data:
         return redirect("upload_file")
@@ -489,69 +849,51 @@ def cpu_memory_usage_view(request):
 
 def inventory_view(request):
     """Displays inventory information for uploaded devices, with optional hostname filtering."""
-    parsed_data = load_data(request)
     hostname_filter = request.GET.get("hostname")
+    hostnames, selected_results = load_selected_results(request, hostname_filter)
 
     filtered_data = {}
-    for filename, details in parsed_data.items():
-        if hostname_filter and hostname_filter != filename:
-            continue
-
+    for filename, details in selected_results:
         device_platform = details.get("model")
-        inventory = []
-        if device_platform == "cisco_ios":
-            inventory = details.get("data", {}).get("show inventory", [])
-        elif device_platform == "aruba_aoscx":
-            inventory = details.get("data", {}).get("show inventory", [])
-        elif device_platform == "huawei_vrp":
-            inventory = details.get("data", {}).get("display device", [])
-        elif device_platform == "huawei_yunshan":
-            inventory = details.get("data", {}).get("display device", [])
+        command = INVENTORY_COMMANDS.get(device_platform)
+        inventory = details.get("data", {}).get(command, []) if command else []
 
         filtered_data[filename] = inventory
 
     return render(request, "parser_app/inventory.html", {
         "inventory_data": filtered_data,
-        "hostnames": list(parsed_data.keys()),
+        "hostnames": hostnames,
         "selected_hostname": hostname_filter
     })
 
 def interfaces_view(request):
     """Displays interface information for uploaded devices, with optional hostname filtering and summary statistics."""
-    parsed_data = load_data(request)
     hostname_filter = request.GET.get("hostname")
+    hostnames, selected_results = load_selected_results(request, hostname_filter)
 
     filtered_data = {}
     link_status_counts = Counter()
     speed_counts = Counter()
 
-    for filename, details in parsed_data.items():
-        if hostname_filter and hostname_filter != filename:
-            continue
-
+    for filename, details in selected_results:
         device_platform = details.get("model")
-        interfaces = []
-        if device_platform == "cisco_ios":
-            interfaces = details.get("data", {}).get("show interfaces", [])
-        elif device_platform == "aruba_aoscx":
-            interfaces = details.get("data", {}).get("show interface", [])
-        elif device_platform == "huawei_vrp":
-            interfaces = details.get("data", {}).get("display interface", [])
-        elif device_platform == "huawei_yunshan":
-            interfaces = details.get("data", {}).get("display interface", [])
+        command = INTERFACE_COMMANDS.get(device_platform)
+        interfaces = details.get("data", {}).get(command, []) if command else []
 
         filtered_data[filename] = interfaces
 
-        for iface in interfaces:
-            link_status = iface.get("link_status", iface.get("status", "unknown")).lower() or "unknown"
-            speed = iface.get("speed", iface.get("bandwidth", "unknown")).lower() or "unknown"
-
-            link_status_counts[link_status] += 1
-            speed_counts[speed] += 1
+    # Counter.update counts an iterable in C; an empty value is reported as "unknown" too
+    all_interfaces = [iface for interfaces in filtered_data.values() for iface in interfaces]
+    link_status_counts.update(
+        iface.get("link_status", iface.get("status", "unknown")).lower() or "unknown" for iface in all_interfaces
+    )
+    speed_counts.update(
+        iface.get("speed", iface.get("bandwidth", "unknown")).lower() or "unknown" for iface in all_interfaces
+    )
 
     return render(request, "parser_app/interfaces.html", {
         "interface_data": filtered_data,
-        "hostnames": list(parsed_data.keys()),
+        "hostnames": hostnames,
         "selected_hostname": hostname_filter,
         "link_status_labels": list(link_status_counts.keys()),
         "link_status_values": list(link_status_counts.values()),